@@ -1,24 +1,103 @@
 # app.py
 
 # استيراد المكتبات اللازمة
+# المكتبات الثقيلة (pandas, numpy, matplotlib, requests) لا تُستورد هنا،
+# لأن Streamlit يعيد تنفيذ هذا الملف مع كل تفاعل؛ تُستورد فقط عند استخدام الميزة التي تحتاجها.
+import math
 import streamlit as st
-import pandas as pd
-import numpy as np
-import requests
 from datetime import datetime, timedelta
-import json
-import re
-import matplotlib.pyplot as plt 
 
 # استيراد المكونات من الملفات الأخرى
-from config import CITIES
-from data_fetcher import get_nasa_weather, create_weather_dataframe, NASA_DATA_START_YEAR
-from ai_planner import generate_schedule
-from utils import extract_time_from_activity
+from config import CITIES, RESULT_STORE_MAX_BYTES
+from result_store import ResultStore, put_session_results, get_session_results
 
 # --- إعدادات الصفحة ---
 st.set_page_config(page_title="Smart Activity Planner", layout="wide")
 
+# --- مخزن النتائج المشترك بين كل الجلسات ---
+# النتائج الكبيرة لا تُحفظ في st.session_state مباشرة، بل في مخزن واحد بميزانية ذاكرة محددة.
+# التنبؤ (نفس المدينة والتواريخ) مشترك بين كل المستخدمين، وجدول كل جلسة في مدخل خاص يشير إليه،
+# والجلسة تحتفظ فقط بمفتاح هذا المدخل.
+
+@st.cache_resource
+def get_result_store():
+    return ResultStore(RESULT_STORE_MAX_BYTES)
+
+@st.cache_resource
+def get_pyplot():
+    """تهيئة matplotlib مرة واحدة لكل العملية، وفقط عند أول رسم"""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    return plt
+
+# --- الجداول والرسوم تُبنى مرة واحدة لكل نتيجة وتُعاد في كل تفاعل لاحق ---
+# تُحفظ داخل مدخل التنبؤ في المخزن نفسه، فتُحسب ضمن ميزانية الذاكرة وتُخلى معه.
+def get_rendered(results_key, name, build, *args):
+    return get_result_store().get_or_build(results_key, name, lambda: build(*args))
+
+def build_weather_dataframe(weather_data):
+    from data_fetcher import create_weather_dataframe
+    return create_weather_dataframe(weather_data)
+
+def build_trend_chart(date, city, hist, trend, predicted_temp):
+    """رسم اتجاه درجة الحرارة عبر السنين وإرجاعه كصورة PNG"""
+    import io
+    import numpy as np
+
+    years = list(hist.keys())
+    temps = [hist[y]['temperature'] for y in years]
+    slope = trend['temperature']['slope']
+    intercept = trend['temperature']['intercept']
+
+    plt = get_pyplot()
+    fig, ax = plt.subplots()
+    ax.scatter(years, temps, color='royalblue', label='Historical Data Points')
+
+    trend_line_x = np.array([min(years), max(years), date.year])
+    trend_line_y = slope * trend_line_x + intercept
+    ax.plot(trend_line_x, trend_line_y, color='red', linestyle='--', linewidth=2, label='Trend Line')
+
+    ax.scatter(date.year, predicted_temp, color='green', s=100, zorder=5, label=f'Predicted ({date.year})')
+
+    ax.set_xlabel("Year")
+    ax.set_ylabel("Temperature (°C)")
+    ax.set_title(f"Temperature Trend for {date.strftime('%B %d')} in {city}")
+    ax.legend()
+    ax.grid(True, linestyle=':', alpha=0.6)
+
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", dpi=200, bbox_inches="tight")
+    plt.close(fig)
+    return buffer.getvalue()
+
+def build_hourly_dataframe(predicted_hourly):
+    import pandas as pd
+    return pd.DataFrame(predicted_hourly).set_index('hour')
+
+def show_memory_usage(placeholder):
+    """عرض استخدام المخزن المشترك للذاكرة داخل مكان محجوز في الشريط الجانبي"""
+    store_usage = get_result_store().usage()
+    placeholder.caption(
+        f"Cached results: {store_usage['entries']} · "
+        f"~{store_usage['used_bytes'] / (1024 * 1024):.1f} / {store_usage['max_bytes'] / (1024 * 1024):.0f} MB (estimated), "
+        f"incl. ~{store_usage['rendered_bytes'] / (1024 * 1024):.1f} MB of rendered charts and tables · "
+        f"Evictions: {store_usage['evictions']}"
+    )
+
+def load_session_results():
+    """استرجاع نتائج الجلسة من المخزن، مع تنبيه المستخدم إذا تم إخلاؤها لتوفير الذاكرة"""
+    results_key = st.session_state.get('results_key')
+    if results_key is None:
+        return None, {}
+
+    forecast_key, results = get_session_results(get_result_store(), results_key)
+    if results is None:
+        del st.session_state['results_key']
+        st.warning("Your previous results were removed from the shared cache to free memory. Please create the schedule again.")
+        return None, {}
+    return forecast_key, results
+
 # --- واجهة المستخدم ---
 st.title("🗓️ Smart Activity Planner")
 st.markdown("---")
@@ -29,6 +108,11 @@ with st.sidebar:
     st.header("🤖 Model Settings")
     st.info("This app uses a local Ollama model (`llama2`) for generating schedules. Please ensure Ollama is running on your machine.")
 
+    st.header("💾 Memory Usage")
+    # يُحدّث مرة أخرى في نهاية الصفحة بعد أي تخزين جديد
+    memory_usage_placeholder = st.empty()
+    show_memory_usage(memory_usage_placeholder)
+
 # --- باقي الكود يبقى كما هو بدون أي تغيير ---
 # (من هنا إلى نهاية الملف، الكود هو نفسه الذي أرسلته)
 # لقد قمت فقط بإزالة الجزء المتعلق بـ OpenAI.
@@ -45,12 +129,17 @@ else:
     activities = st.text_area("Enter your weekly activities (one per line with day):", height=200, placeholder="Monday: Team meeting\nTuesday: Outdoor photoshoot\n...")
 
 # --- منطق التطبيق عند الضغط على الزر ---
+# النتائج التي تم إنشاؤها في هذا التنفيذ تُعرض مباشرة حتى لو لم يتم حفظها في المخزن
+fresh_results = None
+
 # لقد قمت بإزالة شرط التحقق من مفتاح API
 if st.button("🧠 Create Smart Schedule"):
     if not activities:
         st.warning("Please enter your activities!")
     else:
         with st.spinner("📈 Analyzing decades of historical data to predict weather patterns..."):
+            from data_fetcher import get_nasa_weather, NASA_DATA_START_YEAR
+
             target_date = selected_date if plan_type == "Daily Plan" else start_date
             st.info(f"Analyzing historical data for {target_date.strftime('%Y-%m-%d')} based on trends from {NASA_DATA_START_YEAR} onwards.")
             
@@ -84,10 +173,6 @@ if st.button("🧠 Create Smart Schedule"):
                     st.error("Could not retrieve weather forecast for any of the selected days.")
                     st.stop()
             
-            st.session_state['weather_data'] = weather_data
-            st.session_state['historical_data'] = historical_data_for_plot
-            st.session_state['trend_data'] = trend_data_for_plot
-            st.session_state['predicted_hourly_data'] = predicted_hourly_data_for_plot
             st.session_state['activities'] = activities
             st.session_state['plan_type'] = plan_type
             st.session_state['selected_city'] = selected_city
@@ -95,35 +180,60 @@ if st.button("🧠 Create Smart Schedule"):
                 st.session_state['start_date'] = start_date
                 st.session_state['end_date'] = end_date
 
+            forecast = {
+                'weather_data': weather_data,
+                'historical_data': historical_data_for_plot,
+                'trend_data': trend_data_for_plot,
+                'predicted_hourly_data': predicted_hourly_data_for_plot,
+            }
+            ai_schedule = None
+
             try:
+                from ai_planner import generate_schedule
                 ai_schedule = generate_schedule(
                     weather_data,
-                    st.session_state.get('predicted_hourly_data', {}),
+                    predicted_hourly_data_for_plot,
                     activities,
                     plan_type,
                     selected_city,
                     selected_date if plan_type == "Daily Plan" else None
                 )
-                st.session_state['ai_schedule'] = ai_schedule
-                st.success("Smart schedule created successfully!")
             except Exception as e:
                 st.error(str(e))
 
-if 'weather_data' in st.session_state:
+            fresh_results = dict(forecast)
+            if ai_schedule is not None:
+                fresh_results['ai_schedule'] = ai_schedule
+
+            session_key, results_key, stored = put_session_results(get_result_store(), forecast, ai_schedule)
+            if not stored:
+                st.session_state.pop('results_key', None)
+                st.error("These results are too large for the shared result cache. They are shown below but will be lost on the next interaction.")
+            else:
+                st.session_state['results_key'] = session_key
+                if ai_schedule is not None:
+                    st.success("Smart schedule created successfully!")
+
+if fresh_results is not None:
+    results = fresh_results
+else:
+    results_key, results = load_session_results()
+
+if 'weather_data' in results:
     st.subheader("🌤️ Predicted Weather Data (Based on Historical Trends)")
-    weather_df = create_weather_dataframe(st.session_state['weather_data'])
+    weather_df = get_rendered(results_key, 'weather_df', build_weather_dataframe, results['weather_data'])
     st.dataframe(weather_df, use_container_width=True)
 
-    if 'ai_schedule' in st.session_state:
+    if 'ai_schedule' in results:
         st.subheader(f"📅 Smart Schedule for {st.session_state['selected_city']}")
-        st.markdown(st.session_state['ai_schedule'])
+        st.markdown(results['ai_schedule'])
 
-if 'weather_data' in st.session_state:
+if 'weather_data' in results:
     st.subheader("🌤️ Detailed Weather Information & Trend Analysis")
     
-    weather_data = st.session_state['weather_data']
-    historical_data = st.session_state['historical_data']
-    trend_data = st.session_state['trend_data']
+    weather_data = results['weather_data']
+    historical_data = results.get('historical_data', {})
+    trend_data = results.get('trend_data', {})
     
     for date, data in weather_data.items():
         if data:
@@ -147,29 +257,14 @@ if 'weather_data' in st.session_state:
                 hist = historical_data.get(date)
                 trend = trend_data.get(date)
                 
-                if hist and trend and not np.isnan(trend['temperature']['slope']):
-                    years = list(hist.keys())
-                    temps = [hist[y]['temperature'] for y in years]
+                if hist and trend and not math.isnan(trend['temperature']['slope']):
                     slope = trend['temperature']['slope']
-                    intercept = trend['temperature']['intercept']
-                    predicted_temp = data['temperature']
-
-                    fig, ax = plt.subplots()
-                    ax.scatter(years, temps, color='royalblue', label='Historical Data Points')
-                    
-                    trend_line_x = np.array([min(years), max(years), date.year])
-                    trend_line_y = slope * trend_line_x + intercept
-                    ax.plot(trend_line_x, trend_line_y, color='red', linestyle='--', linewidth=2, label='Trend Line')
-                    
-                    ax.scatter(date.year, predicted_temp, color='green', s=100, zorder=5, label=f'Predicted ({date.year})')
-                    
-                    ax.set_xlabel("Year")
-                    ax.set_ylabel("Temperature (°C)")
-                    ax.set_title(f"Temperature Trend for {date.strftime('%B %d')} in {st.session_state['selected_city']}")
-                    ax.legend()
-                    ax.grid(True, linestyle=':', alpha=0.6)
-                    
-                    st.pyplot(fig)
+                    city = st.session_state['selected_city']
+                    trend_chart = get_rendered(
+                        results_key, ('trend_chart', date, city), build_trend_chart,
+                        date, city, hist, trend, data['temperature']
+                    )
+                    st.image(trend_chart, width="stretch")
                     
                     if slope > 0.05:
                         st.success("📈 The trend shows a clear **increase** in temperature over the years.")
@@ -181,18 +276,17 @@ if 'weather_data' in st.session_state:
                     st.info("Not enough historical data to generate a reliable trend analysis.")
 
                 st.subheader("🕐 Predicted Hourly Temperature")
-                predicted_hourly = st.session_state.get('predicted_hourly_data', {}).get(date)
+                predicted_hourly = results.get('predicted_hourly_data', {}).get(date)
                 
                 if predicted_hourly:
-                    hourly_df = pd.DataFrame(predicted_hourly)
-                    hourly_df = hourly_df.set_index('hour')
+                    hourly_df = get_rendered(results_key, ('hourly_df', date), build_hourly_dataframe, predicted_hourly)
                     st.dataframe(hourly_df[['temperature']])
                     
                     st.line_chart(hourly_df['temperature'])
                 else:
                     st.info("Could not generate hourly predictions.")
 
-if 'weather_data' in st.session_state:
+if 'weather_data' in results:
     st.subheader("💡 Smart Recommendations")
     
     activities_list = [act.strip() for act in activities.split('\n') if act.strip()]
@@ -262,13 +356,13 @@ if 'weather_data' in st.session_state:
                 st.write("- Avoid peak hours for less crowded experience")
                 st.write("- Bring reusable bags for your purchases")
 
-if 'ai_schedule' in st.session_state:
+if 'ai_schedule' in results:
     st.subheader("💾 Save & Share Your Schedule")
     
     col1, col2 = st.columns(2)
     
     with col1:
-        schedule_text = st.session_state['ai_schedule']
+        schedule_text = results['ai_schedule']
         st.download_button(
             label="Download as Text",
             data=schedule_text,
@@ -298,4 +392,6 @@ if st.button("Submit Feedback"):
         st.metric("Weather Data Points", len(weather_data))
     
     with col3:
-        st.metric("City", selected_city)
\ No newline at end of file
+        st.metric("City", selected_city)
+
+show_memory_usage(memory_usage_placeholder)
\ No newline at end of file
@@ -0,0 +1,175 @@
+# benchmark_startup.py
+"""
+قياس زمن بدء تشغيل التطبيق باستخدام AppTest من Streamlit (بدون متصفح أو شبكة):
+
+- cold start: عملية Python جديدة تستورد streamlit وتعرض الصفحة لأول مرة
+- first render: أول تنفيذ للسكربت داخل عملية جاهزة
+- rerun (empty): إعادة التنفيذ بعد الكتابة في مربع الأنشطة قبل إنشاء أي جدول
+- create schedule: الضغط على الزر (بيانات ناسا و Ollama مستبدلة ببيانات ثابتة)
+- rerun (results): إعادة التنفيذ بعد الكتابة والنتائج والرسوم معروضة
+
+الاستخدام:
+    python benchmark_startup.py --repeat 5 --reruns 20 --plan weekly
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+APP_PATH = Path(__file__).resolve().parent / "app.py"
+HEAVY_MODULES = ["pandas", "numpy", "matplotlib", "requests"]
+
+COLD_START_SNIPPET = """
+import json
+import sys
+import time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+before = set(sys.modules)
+at = AppTest.from_file({app_path!r}, default_timeout=60)
+at.run()
+elapsed = time.perf_counter() - start
+loaded = sorted({{name.split('.')[0] for name in set(sys.modules) - before}})
+preloaded = sorted({{name.split('.')[0] for name in before}})
+print(json.dumps({{"elapsed": elapsed, "loaded": loaded, "preloaded": preloaded}}))
+"""
+
+
+def loaded_heavy_modules(before):
+    """المكتبات الثقيلة التي استوردها التطبيق نفسه (وليس streamlit أو AppTest قبل التشغيل)"""
+    new_modules = {name.split('.')[0] for name in set(sys.modules) - before}
+    return [name for name in HEAVY_MODULES if name in new_modules]
+
+
+def measure_cold_start(repeat):
+    """تشغيل عملية جديدة في كل مرة لقياس زمن البدء من الصفر"""
+    timings = []
+    loaded_heavy = []
+    preloaded_heavy = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", COLD_START_SNIPPET.format(app_path=str(APP_PATH))],
+            check=True,
+            capture_output=True,
+            text=True,
+            cwd=APP_PATH.parent,
+        )
+        report = json.loads(output.stdout.strip().splitlines()[-1])
+        timings.append(report["elapsed"])
+        loaded_heavy = [name for name in HEAVY_MODULES if name in report["loaded"]]
+        preloaded_heavy = [name for name in HEAVY_MODULES if name in report["preloaded"]]
+    return timings, loaded_heavy, preloaded_heavy
+
+
+def fake_nasa_weather(city_coords, date):
+    """بيانات ثابتة بنفس شكل get_nasa_weather حتى لا يعتمد القياس على الشبكة"""
+    base = {
+        "temperature": 22.0,
+        "humidity": 55.0,
+        "wind_speed": 3.5,
+        "precipitation": 0.4,
+        "pressure": 101.2,
+        "solar_radiation": 240.0,
+    }
+    historical = {year: dict(base, temperature=20.0 + (year - 1981) * 0.04) for year in range(1981, date.year)}
+    trend = {param: {"slope": 0.04, "intercept": -59.24} for param in base}
+    hourly = [
+        {"hour": hour, "temperature": 18.0 + hour * 0.3, "humidity": 55.0, "wind_speed": 3.5, "precipitation": 0.0}
+        for hour in range(24)
+    ]
+    return dict(base), historical, trend, hourly
+
+
+def fake_schedule(weather_data, hourly_weather_data, activities, plan_type, city, selected_date=None):
+    return "## Optimized Schedule\n" + "\n".join(f"08:00: {line}" for line in activities.splitlines())
+
+
+def install_stubs():
+    """استبدال الاتصال بناسا و Ollama؛ التطبيق يستورد الدالتين عند الحاجة فيلتقط النسخ المستبدلة"""
+    import ai_planner
+    import data_fetcher
+
+    data_fetcher.get_nasa_weather = fake_nasa_weather
+    ai_planner.generate_schedule = fake_schedule
+
+
+def time_reruns(at, reruns, label):
+    timings = []
+    for i in range(reruns):
+        start = time.perf_counter()
+        at.text_area[0].input(f"Morning jog\nPicnic in the park\nGrocery shopping {label} {i}").run()
+        timings.append(time.perf_counter() - start)
+        if at.exception:
+            raise RuntimeError(f"App raised an exception: {at.exception}")
+    return timings
+
+
+def measure_in_process(reruns, plan):
+    """قياس أول عرض، ثم إعادة التنفيذ قبل وبعد إنشاء الجدول داخل نفس العملية"""
+    from streamlit.testing.v1 import AppTest
+
+    sys.path.insert(0, str(APP_PATH.parent))
+    at = AppTest.from_file(str(APP_PATH), default_timeout=60)
+
+    before = set(sys.modules)
+    start = time.perf_counter()
+    at.run()
+    first_render = time.perf_counter() - start
+    if at.exception:
+        raise RuntimeError(f"App raised an exception: {at.exception}")
+    loaded_heavy = loaded_heavy_modules(before)
+
+    empty_reruns = time_reruns(at, reruns, "empty")
+
+    install_stubs()
+    if plan == "weekly":
+        at.radio[0].set_value("Weekly Plan").run()
+        # مربع الأنشطة الأسبوعية عنصر مختلف، فيجب ملؤه قبل الضغط على الزر
+        at.text_area[0].input("Morning jog\nPicnic in the park\nGrocery shopping").run()
+    start = time.perf_counter()
+    at.button[0].click().run()
+    create_schedule = time.perf_counter() - start
+    if at.exception:
+        raise RuntimeError(f"App raised an exception: {at.exception}")
+    if not at.expander:
+        raise RuntimeError("The app did not show any results after clicking the button.")
+
+    result_reruns = time_reruns(at, reruns, "results")
+
+    return first_render, loaded_heavy, empty_reruns, create_schedule, result_reruns
+
+
+def describe(label, timings):
+    ms = [t * 1000 for t in timings]
+    print(
+        f"{label:<17} median {statistics.median(ms):8.1f} ms   "
+        f"min {min(ms):8.1f} ms   max {max(ms):8.1f} ms   (n={len(ms)})"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark cold start and rerun time of the Streamlit app.")
+    parser.add_argument("--repeat", type=int, default=5, help="number of cold-start processes")
+    parser.add_argument("--reruns", type=int, default=20, help="number of interaction reruns")
+    parser.add_argument("--plan", choices=["daily", "weekly"], default="weekly", help="plan type used for the results reruns")
+    args = parser.parse_args()
+
+    cold_timings, cold_heavy, preloaded_heavy = measure_cold_start(args.repeat)
+    describe("cold start", cold_timings)
+
+    first_render, loaded_heavy, empty_reruns, create_schedule, result_reruns = measure_in_process(args.reruns, args.plan)
+    describe("first render", [first_render])
+    describe("rerun (empty)", empty_reruns)
+    describe("create schedule", [create_schedule])
+    describe("rerun (results)", result_reruns)
+    # ما تستورده streamlit نفسها لا يمكن للتطبيق تأجيله
+    print(f"heavy modules already loaded by streamlit/AppTest: {', '.join(preloaded_heavy) or 'none'}")
+    print(f"heavy modules loaded by the app on cold start: {', '.join(cold_heavy) or 'none'}")
+    print(f"heavy modules loaded by the app on first render: {', '.join(loaded_heavy) or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,4 @@
-import streamlit as st
-
-st.set_page_config(page_title="Smart Activity Planner", layout="wide")
+import os
 
 CITIES = {
     "Cairo": {"lat": 30.0444, "lon": 31.2357},
@@ -8,4 +6,8 @@ CITIES = {
     "Tokyo": {"lat": 35.6762, "lon": 139.6503},
     "New York": {"lat": 40.7128, "lon": -74.0060},
     "Sydney": {"lat": -33.8688, "lon": 151.2093}
-}
\ No newline at end of file
+}
+
+# --- ميزانية الذاكرة لمخزن النتائج المشترك بين الجلسات (بالبايت) ---
+# الحجم المحسوب تقدير للذاكرة التي تشغلها النتائج، وليس قياساً دقيقاً لذاكرة العملية.
+RESULT_STORE_MAX_BYTES = int(os.environ.get("RESULT_STORE_MAX_BYTES", 256 * 1024 * 1024))
\ No newline at end of file
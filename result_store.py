@@ -0,0 +1,140 @@
+# result_store.py
+import hashlib
+import pickle
+import sys
+import threading
+from collections import OrderedDict
+
+
+def estimate_size(value, _seen=None):
+    """تقدير الذاكرة التي تشغلها القيمة فعلياً مع كل محتوياتها (وليس حجمها بعد pickle)"""
+    seen = set() if _seen is None else _seen
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(estimate_size(k, seen) + estimate_size(v, seen) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(estimate_size(item, seen) for item in value)
+    return size
+
+
+def content_key(value):
+    """مفتاح ثابت يعتمد على محتوى القيمة، فالقيم المتطابقة لها نفس المفتاح"""
+    payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+    return hashlib.sha256(payload).hexdigest()
+
+
+class ResultStore:
+    """مخزن نتائج مشترك بين الجلسات بميزانية ذاكرة محددة وإخلاء الأقدم استخداماً (LRU)"""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> [value, size, rendered]
+        self._used_bytes = 0
+        self._rendered_bytes = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+
+    def put(self, value):
+        """تخزين قيمة وإرجاع (المفتاح، هل تم التخزين)؛ القيم المتطابقة تُخزن مرة واحدة فقط
+        والقيمة الأكبر من الميزانية لا تُخزن، لكن مفتاحها يُرجع رغم ذلك"""
+        # المفتاح يُستخدم فقط للتعرف على المحتوى المتطابق، أما الحجم فهو تقدير للذاكرة الفعلية
+        key = content_key(value)
+        size = estimate_size(value)
+
+        with self._lock:
+            if key in self._entries:
+                # نفس النتيجة موجودة بالفعل (من نفس المستخدم أو مستخدم آخر)
+                self._entries.move_to_end(key)
+                return key, True
+
+            if size > self.max_bytes:
+                # النتيجة أكبر من الميزانية كلها، لا فائدة من تخزينها
+                return key, False
+
+            self._entries[key] = [value, size, {}]
+            self._used_bytes += size
+            self._evict()
+            return key, key in self._entries
+
+    def get(self, key):
+        """إرجاع القيمة المخزنة أو None إذا تم إخلاؤها"""
+        if key is None:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def get_or_build(self, key, name, build):
+        """إرجاع ناتج مشتق من مدخل (جدول أو رسم) أو بناؤه وحفظه معه،
+        فيُحسب ضمن الميزانية ويُخلى مع المدخل نفسه؛ إذا لم يكن المدخل مخزناً يُبنى بدون حفظ"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and name in entry[2]:
+                self._entries.move_to_end(key)
+                return entry[2][name][0]
+
+        # البناء خارج القفل حتى لا تنتظر الجلسات الأخرى
+        value = build()
+        size = estimate_size(value)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and name not in entry[2]:
+                entry[2][name] = (value, size)
+                entry[1] += size
+                self._used_bytes += size
+                self._rendered_bytes += size
+                self._entries.move_to_end(key)
+                self._evict()
+        return value
+
+    def usage(self):
+        """تقرير عن الاستخدام الحالي للذاكرة"""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "used_bytes": self._used_bytes,
+                "rendered_bytes": self._rendered_bytes,
+                "max_bytes": self.max_bytes,
+                "evictions": self._evictions,
+            }
+
+    def _evict(self):
+        """إخلاء الأقدم استخداماً حتى نعود داخل الميزانية"""
+        while self._used_bytes > self.max_bytes and self._entries:
+            _, (_, size, rendered) = self._entries.popitem(last=False)
+            self._used_bytes -= size
+            self._rendered_bytes -= sum(rendered_size for _, rendered_size in rendered.values())
+            self._evictions += 1
+
+
+def put_session_results(store, forecast, ai_schedule=None):
+    """تخزين نتائج جلسة: التنبؤ في مدخل مشترك بين كل المستخدمين، والجدول في مدخل خاص يشير إليه.
+    يُرجع (مفتاح الجلسة، مفتاح التنبؤ، هل تم حفظ الجزأين)"""
+    forecast_key, forecast_stored = store.put(forecast)
+    session_key, session_stored = store.put({"forecast_key": forecast_key, "ai_schedule": ai_schedule})
+    stored = forecast_stored and session_stored and store.get(forecast_key) is not None
+    return session_key, forecast_key, stored
+
+
+def get_session_results(store, session_key):
+    """استرجاع (مفتاح التنبؤ، النتائج) لجلسة، أو (None, None) إذا تم إخلاء أي من الجزأين"""
+    session_entry = store.get(session_key)
+    if session_entry is None:
+        return None, None
+
+    forecast = store.get(session_entry["forecast_key"])
+    if forecast is None:
+        return None, None
+
+    results = dict(forecast)
+    if session_entry["ai_schedule"] is not None:
+        results["ai_schedule"] = session_entry["ai_schedule"]
+    return session_entry["forecast_key"], results
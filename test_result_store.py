@@ -0,0 +1,119 @@
+# test_result_store.py
+from result_store import ResultStore, estimate_size, get_session_results, put_session_results
+
+
+def test_identical_content_is_stored_once():
+    store = ResultStore(max_bytes=100_000)
+    first, _ = store.put({"temperature": 21.5, "hours": list(range(24))})
+    second, stored = store.put({"temperature": 21.5, "hours": list(range(24))})
+
+    assert first == second
+    assert stored
+    assert store.usage()["entries"] == 1
+
+
+def test_get_refreshes_lru_order():
+    value_size = estimate_size(list(range(50)))
+    store = ResultStore(max_bytes=value_size * 2)
+    old, _ = store.put(list(range(50)))
+    recent, _ = store.put(list(range(50, 100)))
+
+    assert store.get(old) is not None
+    store.put(list(range(100, 150)))
+
+    assert store.get(old) is not None
+    assert store.get(recent) is None
+
+
+def test_evicts_when_budget_exceeded():
+    value_size = estimate_size(list(range(50)))
+    store = ResultStore(max_bytes=value_size * 2)
+    keys = [store.put(list(range(i * 50, (i + 1) * 50)))[0] for i in range(3)]
+
+    assert store.get(keys[0]) is None
+    assert store.get(keys[1]) is not None
+    assert store.get(keys[2]) is not None
+    assert store.usage()["used_bytes"] <= store.max_bytes
+
+
+def test_rejects_value_larger_than_budget():
+    store = ResultStore(max_bytes=100)
+
+    key, stored = store.put(list(range(1000)))
+
+    assert key is not None
+    assert not stored
+    assert store.get(key) is None
+    assert store.get(None) is None
+    assert store.usage()["entries"] == 0
+
+
+def test_usage_counters():
+    value = {"temperature": 21.5}
+    store = ResultStore(max_bytes=estimate_size(value) * 2)
+    store.put(value)
+    store.put({"temperature": 22.5})
+    store.put({"temperature": 23.5})
+
+    usage = store.usage()
+    assert usage["entries"] == 2
+    assert usage["evictions"] == 1
+    assert usage["used_bytes"] == 2 * estimate_size(value)
+    assert usage["max_bytes"] == store.max_bytes
+
+
+def test_sessions_share_forecast_with_different_schedules():
+    store = ResultStore(max_bytes=100_000)
+    forecast = {"weather_data": {"2025-05-01": {"temperature": 24.0}}, "trend_data": {"slope": 0.03}}
+    first_session, first_forecast, first_stored = put_session_results(store, forecast, "08:00: Morning jog")
+    second_session, second_forecast, second_stored = put_session_results(store, dict(forecast), "10:00: Picnic")
+
+    assert first_stored and second_stored
+    assert first_forecast == second_forecast
+    assert first_session != second_session
+    assert store.usage()["entries"] == 3
+
+    forecast_key, results = get_session_results(store, second_session)
+    assert forecast_key == first_forecast
+    assert results["weather_data"] == forecast["weather_data"]
+    assert results["ai_schedule"] == "10:00: Picnic"
+
+
+def test_session_results_missing_when_forecast_evicted():
+    forecast = {"weather_data": {"2025-05-01": {"temperature": 24.0}}}
+    store = ResultStore(max_bytes=estimate_size(forecast) * 3)
+    session_key, _, stored = put_session_results(store, forecast)
+    assert stored
+
+    for i in range(5):
+        store.put({"filler": [i] * 10})
+
+    assert get_session_results(store, session_key) == (None, None)
+
+
+def test_rendered_output_counts_against_budget_and_is_evicted_with_entry():
+    store = ResultStore(max_bytes=100_000)
+    key, _ = store.put({"temperature": 21.5})
+    builds = []
+
+    def build():
+        builds.append(1)
+        return b"x" * 2_000
+
+    assert store.get_or_build(key, "chart", build) == b"x" * 2_000
+    assert store.get_or_build(key, "chart", build) == b"x" * 2_000
+    assert len(builds) == 1
+    assert store.usage()["rendered_bytes"] >= 2_000
+
+    store.max_bytes = estimate_size({"temperature": 22.5})
+    store.put({"temperature": 22.5})
+    assert store.get(key) is None
+    assert store.usage()["rendered_bytes"] == 0
+    assert store.usage()["used_bytes"] == store.max_bytes
+
+
+def test_rendered_output_for_missing_entry_is_not_kept():
+    store = ResultStore(max_bytes=100_000)
+
+    assert store.get_or_build("missing", "chart", lambda: b"png") == b"png"
+    assert store.usage()["rendered_bytes"] == 0